@@ -0,0 +1,27 @@
+# app/__main__.py
+"""
+Runs the Task Bridge with production-oriented uvicorn defaults:
+
+    python -m app
+
+uvloop and httptools replace asyncio's selector loop and the pure-Python
+HTTP parser. WEB_CONCURRENCY sets the number of worker processes (default 1).
+Each worker keeps its own Prometheus registry, so with more than one, a
+/metrics scrape only reports the worker that happened to answer it.
+"""
+
+import uvicorn
+
+from .config import settings
+
+if __name__ == "__main__":
+    # The app is passed as an import string so each worker process imports
+    # its own copy; this module deliberately does not import app.bridge.
+    uvicorn.run(
+        "app.bridge:app",
+        host=settings.host,
+        port=settings.port,
+        loop="uvloop",
+        http="httptools",
+        workers=settings.web_concurrency,
+    )
@@ -6,11 +6,13 @@ running Temporal workflows. It has been refactored to support a multi-tenant
 architecture.
 """
 
-import os
+import asyncio
+import itertools
+import logging
 import re
+import orjson
 import structlog
 from contextlib import asynccontextmanager
-from datetime import datetime
 from typing import Optional
 
 from fastapi import (
@@ -19,34 +21,45 @@ from fastapi import (
     HTTPException,
     Request,
     Path,
-    Body,
     Security,
     APIRouter,
 )
+from fastapi.exceptions import RequestValidationError
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from prometheus_fastapi_instrumentator import Instrumentator
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 from temporalio.client import Client
+from temporalio.common import WorkflowIDReusePolicy
 from temporalio.service import RPCError
 from temporalio.contrib.opentelemetry import TracingInterceptor
 
 from tracerail.service.case_service import CaseService
 from tracerail.domain.cases import Case as CaseResponse
 from tracerail.workflows.flexible_case_workflow import FlexibleCaseWorkflow
+from .config import settings
+from .log_queue import QueueLoggerFactory
+from .polling import query_when_ready
 from .tracing import setup_tracing
 
 
 # --- Structured Logging Setup ---
+# Calls below LOG_LEVEL are bound to no-ops once the logger is cached.
+log_level = logging.getLevelNamesMapping()[settings.log_level]
+# Rendered lines are queued and written to stdout by a background thread, so
+# handlers never block on I/O. The writer starts with the first line logged and
+# is flushed when `lifespan` ends (or at exit, if the lifespan never ran).
+log_sink = QueueLoggerFactory()
 structlog.configure(
     processors=[
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.JSONRenderer(),
+        structlog.processors.JSONRenderer(serializer=orjson.dumps),
     ],
-    logger_factory=structlog.PrintLoggerFactory(),
+    logger_factory=log_sink,
+    wrapper_class=structlog.make_filtering_bound_logger(log_level),
     cache_logger_on_first_use=True,
 )
 log = structlog.get_logger()
@@ -55,36 +68,55 @@ log = structlog.get_logger()
 # --- Application Lifespan Management ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Manages the Temporal client's lifecycle with the FastAPI application."""
+    """Manages the Temporal client pool's lifecycle with the FastAPI application."""
     setup_tracing("tracerail-task-bridge")
+    app.state.temporal_clients = []
+    app.state.temporal_client = None
+    app.state.case_services = None
 
-    if os.getenv("TESTING_MODE") == "true":
-        log.info("Running in TESTING_MODE, skipping Temporal connection.")
-        app.state.temporal_client = None
-        yield
-        return
-
-    host = os.getenv("TEMPORAL_HOST", "localhost")
-    port = int(os.getenv("TEMPORAL_PORT", 7233))
-    # In a multi-tenant setup, we connect to the 'default' namespace.
-    # The CaseService is responsible for creating clients for specific tenant namespaces.
-    namespace = "default"
-    target = f"{host}:{port}"
-
-    log.info("Connecting to Temporal service", target=target)
     try:
-        client = await Client.connect(
-            target,
-            namespace=namespace,
-            interceptors=[TracingInterceptor()],
+        if settings.testing_mode:
+            log.info("Running in TESTING_MODE, skipping Temporal connection.")
+            yield
+            return
+
+        # Each client owns its own gRPC channel, so spreading requests across a
+        # small pool avoids head-of-line blocking on a single connection.
+        pool_size = settings.temporal_pool_size
+        # In a multi-tenant setup, we connect to the 'default' namespace.
+        # The CaseService is responsible for creating clients for specific tenant namespaces.
+        namespace = "default"
+        target = settings.temporal_target
+
+        log.info("Connecting to Temporal service", target=target, pool_size=pool_size)
+        results = await asyncio.gather(
+            *(
+                Client.connect(
+                    target,
+                    namespace=namespace,
+                    interceptors=[TracingInterceptor()],
+                )
+                for _ in range(pool_size)
+            ),
+            return_exceptions=True,
+        )
+        # Record every client that did connect before surfacing a failure.
+        clients = [result for result in results if isinstance(result, Client)]
+        app.state.temporal_clients = clients
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        app.state.temporal_client = clients[0]
+        # One CaseService per pooled client, built once and handed out round-robin.
+        app.state.case_services = itertools.cycle(
+            [CaseService(client=client) for client in clients]
         )
-        app.state.temporal_client = client
         log.info("Successfully connected to Temporal.")
         yield
     finally:
-        if hasattr(app.state, "temporal_client") and app.state.temporal_client:
-            await app.state.temporal_client.close()
-            log.info("Temporal client connection closed.")
+        # temporalio clients have no close(); their connections are released
+        # once the clients are garbage collected. Flush any queued log lines.
+        log_sink.stop()
 
 
 # --- FastAPI Application Setup ---
@@ -93,11 +125,13 @@ app = FastAPI(
     description="A multi-tenant bridge service for interacting with TraceRail workflows.",
     version="3.1.0",
     lifespan=lifespan,
+    # Serialize JSON responses with orjson instead of the stdlib json module.
+    default_response_class=ORJSONResponse,
 )
 
 # --- CORS Middleware ---
 allowed_origins = [
-    os.getenv("FRONTEND_URL", "http://localhost:3000"),
+    settings.frontend_url,
     "http://localhost:3002",
 ]
 app.add_middleware(
@@ -109,11 +143,21 @@ app.add_middleware(
 )
 
 # --- Metrics and Tracing Instrumentation ---
-Instrumentator().instrument(app).expose(app)
+# Handler patterns are matched with re.search, so they must be anchored. Only
+# API routes are worth a latency histogram; grouping status codes ("2xx")
+# keeps label cardinality low.
+Instrumentator(
+    excluded_handlers=["^/$", "^/metrics$", "^/_pact/.*"],
+    should_group_status_codes=True,
+    should_ignore_untemplated=True,
+).instrument(app).expose(app)
 FastAPIInstrumentor.instrument_app(app)
 
 # --- Authentication & Authorization ---
 api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
+# The prefix and its length are constant, so compute them once rather than per request.
+auth_token_prefix = "Bearer test-token-for-"
+auth_token_prefix_len = len(auth_token_prefix)
 
 async def get_tenant_id_from_auth(
     api_key: str = Security(api_key_header),
@@ -128,14 +172,13 @@ async def get_tenant_id_from_auth(
             status_code=401, detail="Authorization header is missing"
         )
 
-    expected_prefix = f"Bearer test-token-for-"
-    if not api_key.startswith(expected_prefix):
+    if not api_key.startswith(auth_token_prefix):
         raise HTTPException(status_code=401, detail="Invalid authorization scheme.")
 
     # In a real system, the token would be a JWT or an opaque token that is
     # validated and mapped to a tenantId server-side. For this test, we embed
     # the tenantId in the token itself for simplicity.
-    token_tenant_id = api_key[len(expected_prefix):]
+    token_tenant_id = api_key[auth_token_prefix_len:]
     if token_tenant_id != tenantId:
         raise HTTPException(
             status_code=403, detail="Token is not valid for the specified tenant."
@@ -144,24 +187,57 @@ async def get_tenant_id_from_auth(
 
 
 # --- Dependency Injection ---
-def get_case_service(request: Request) -> CaseService:
-    """Dependency provider that creates and yields a CaseService instance."""
-    client: Optional[Client] = request.app.state.temporal_client
-    if not client:
+async def get_case_service(request: Request) -> CaseService:
+    """Dependency provider that yields the next CaseService from the client pool."""
+    case_services = request.app.state.case_services
+    if not case_services:
         raise HTTPException(status_code=503, detail="Temporal client is not available.")
-    return CaseService(client=client)
+    return next(case_services)
 
 
 # --- Pydantic Models ---
 class AgentDecisionPayload(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     decision: str = Field(..., description="The decision made by the agent.")
 
 class DecisionResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     caseId: str
     status: str
     message: str
 
 
+async def parse_decision_payload(request: Request) -> AgentDecisionPayload:
+    """
+    Validates the raw request body straight from JSON in a single pydantic-core
+    pass, instead of FastAPI's json.loads -> dict -> model_validate round-trip.
+    """
+    body = await request.body()
+    if not body:
+        # FastAPI reports a missing body as a single "missing" error at ("body",).
+        raise RequestValidationError(
+            [{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}]
+        )
+    try:
+        return AgentDecisionPayload.model_validate_json(body)
+    except ValidationError as e:
+        # Match the error shape FastAPI produces for regular body parameters.
+        raise RequestValidationError(
+            [_as_body_error(err) for err in e.errors(include_url=False)]
+        ) from e
+
+
+def _as_body_error(err: dict) -> dict:
+    err = {**err, "loc": ("body", *err["loc"])}
+    if err["type"] == "json_invalid":
+        # The input is the raw body, which need not even be valid UTF-8 and so
+        # cannot be echoed back; FastAPI itself reports {} here.
+        err["input"] = {}
+    return err
+
+
 # --- Tenant-Aware API Router ---
 tenant_router = APIRouter(
     prefix="/api/v1/tenants/{tenantId}",
@@ -181,11 +257,23 @@ async def get_case_by_id(
         return case
     raise HTTPException(status_code=404, detail=f"Case with ID '{caseId}' not found.")
 
-@tenant_router.post("/cases/{caseId}/decision", response_model=DecisionResponse)
+@tenant_router.post(
+    "/cases/{caseId}/decision",
+    response_model=DecisionResponse,
+    # The body is parsed by `parse_decision_payload`, so declare it for OpenAPI.
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": AgentDecisionPayload.model_json_schema()}
+            },
+        }
+    },
+)
 async def submit_tenant_decision(
     tenantId: str,
     caseId: str,
-    payload: AgentDecisionPayload = Body(...),
+    payload: AgentDecisionPayload = Depends(parse_decision_payload),
     case_service: CaseService = Depends(get_case_service),
 ):
     """Receives a decision from an agent and signals the corresponding workflow."""
@@ -210,10 +298,10 @@ app.include_router(tenant_router)
 
 
 # --- General & Pact Endpoints ---
-@app.get("/", response_class=HTMLResponse, tags=["General"])
-async def root():
-    """Provides a simple HTML landing page with links to the documentation."""
-    return """
+# The landing page never changes, so it is encoded once at import. A fresh
+# HTMLResponse is still built per request because middleware (e.g. CORS)
+# mutates response headers in place.
+root_page = """
     <html>
         <head><title>TraceRail Task Bridge</title></head>
         <body style="font-family: sans-serif; padding: 2em;">
@@ -225,9 +313,26 @@ async def root():
             </ul>
         </body>
     </html>
-    """
+    """.encode("utf-8")
+
+@app.get("/", response_class=HTMLResponse, tags=["General"])
+async def root():
+    """Provides a simple HTML landing page with links to the documentation."""
+    return HTMLResponse(content=root_page)
+
+# This regex handles both provider states defined in the consumer contract.
+# It is compiled once at import rather than on every state setup request.
+provider_state_pattern = re.compile(
+    r"case with ID ([\w-]+) (?:exists|is ready for a decision) for tenant with ID ([\w-]+)"
+)
+
+# The handler's replies never vary, so they are serialized once at import.
+provider_state_ok = orjson.dumps({"result": "ok"})
+provider_state_not_found = orjson.dumps({"result": "State not found"})
 
 class ProviderState(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     consumer: str
     state: str
 
@@ -239,15 +344,11 @@ async def provider_states_handler(payload: ProviderState, request: Request):
     if not client:
         raise HTTPException(status_code=503, detail="Temporal client is not available.")
 
-    # This regex handles both provider states defined in the consumer contract.
-    state_pattern = re.compile(
-        r"case with ID ([\w-]+) (?:exists|is ready for a decision) for tenant with ID ([\w-]+)"
-    )
-    match = state_pattern.search(payload.state)
+    match = provider_state_pattern.search(payload.state)
 
     if not match:
         log.warn("Provider state not recognized", state=payload.state)
-        return {"result": "State not found"}
+        return Response(content=provider_state_not_found, media_type="application/json")
 
     case_id, tenant_id = match.groups()
     task_queue = "pact-verification-task-queue"
@@ -256,14 +357,17 @@ async def provider_states_handler(payload: ProviderState, request: Request):
     try:
         # In Phase 2, this would connect to the correct tenant namespace.
         # For now, we run the workflow in the default namespace.
-        await client.start_workflow(
+        handle = await client.start_workflow(
             FlexibleCaseWorkflow.run,
             args=["expense_approval", "1.0.0", {"submitter_name": "Pact Test"}],
             id=case_id,
             task_queue=task_queue,
-            id_reuse_policy="TerminateIfRunning",
+            # Replaces any run left over from a previous interaction in one RPC.
+            id_reuse_policy=WorkflowIDReusePolicy.TERMINATE_IF_RUNNING,
         )
-        return {"result": "ok"}
-    except RPCError as e:
+        # Only report the state as ready once the workflow can serve the case.
+        await query_when_ready(handle)
+        return Response(content=provider_state_ok, media_type="application/json")
+    except (RPCError, TimeoutError) as e:
         log.error("Failed to set up provider state", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to start workflow for Pact state")
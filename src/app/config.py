@@ -0,0 +1,52 @@
+# app/config.py
+import logging
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    The bridge's environment configuration, read once at import time so that
+    request handlers and startup code use plain attribute lookups instead of
+    repeated `os.getenv` calls.
+    """
+
+    log_level: str
+    testing_mode: bool
+    temporal_host: str
+    temporal_port: int
+    temporal_pool_size: int
+    frontend_url: str
+    host: str
+    port: int
+    web_concurrency: int
+
+    @property
+    def temporal_target(self) -> str:
+        return f"{self.temporal_host}:{self.temporal_port}"
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+        level_names = logging.getLevelNamesMapping()
+        if log_level not in level_names:
+            raise ValueError(
+                f"Invalid LOG_LEVEL {log_level!r}; expected one of {', '.join(level_names)}."
+            )
+        return cls(
+            log_level=log_level,
+            testing_mode=os.getenv("TESTING_MODE") == "true",
+            temporal_host=os.getenv("TEMPORAL_HOST", "localhost"),
+            temporal_port=int(os.getenv("TEMPORAL_PORT", 7233)),
+            temporal_pool_size=max(1, int(os.getenv("TEMPORAL_POOL_SIZE", 4))),
+            frontend_url=os.getenv("FRONTEND_URL", "http://localhost:3000"),
+            host=os.getenv("HOST", "0.0.0.0"),
+            port=int(os.getenv("PORT", 8000)),
+            # Prometheus metrics live in per-process registries and /metrics is
+            # not set up for multiprocess mode, so one worker is the safe default.
+            web_concurrency=max(1, int(os.getenv("WEB_CONCURRENCY", 1))),
+        )
+
+
+settings = Settings.from_env()
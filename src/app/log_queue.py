@@ -0,0 +1,94 @@
+# app/log_queue.py
+import atexit
+import queue
+import sys
+import threading
+from typing import Any, Callable, Optional
+
+# Sentinel placed on the queue to tell the writer thread to exit.
+_STOP = object()
+
+
+class QueueLogger:
+    """
+    A structlog logger that hands rendered log lines to a queue instead of
+    writing them itself. Request handlers on the event loop therefore never
+    block on stdout; the actual write happens on a background thread.
+    """
+
+    def __init__(self, write: Callable[[bytes], None]):
+        self._write = write
+
+    def msg(self, message: bytes) -> None:
+        self._write(message + b"\n")
+
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+
+
+class QueueLoggerFactory:
+    """
+    A structlog logger factory whose loggers all share one queue, plus the
+    background thread that drains that queue to stdout.
+
+    The writer thread is started by the first queued line, so nothing logged
+    at import time or outside the app's lifespan is left stranded, and it is
+    stopped (flushing the queue) at interpreter exit at the latest.
+    """
+
+    def __init__(self):
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        return QueueLogger(self.write)
+
+    def write(self, line: bytes) -> None:
+        """Queues a rendered line, (re)starting the writer thread if needed."""
+        # Checked and queued under the lock, so a line can never land behind
+        # the stop sentinel of a writer that is shutting down.
+        with self._lock:
+            self._ensure_running()
+            self.queue.put_nowait(line)
+
+    def start(self) -> None:
+        """Starts the writer thread. Calling this twice is a no-op."""
+        with self._lock:
+            self._ensure_running()
+
+    def _ensure_running(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._drain, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Writes out every queued line and stops the writer thread."""
+        with self._lock:
+            if not self._thread:
+                return
+            # A writer that died would leave the sentinel (and the backlog) unread.
+            self._ensure_running()
+            self.queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _drain(self) -> None:
+        while True:
+            line = self.queue.get()
+            try:
+                if line is not _STOP:
+                    sys.stdout.buffer.write(line)
+                # Only flush once the backlog is written, so bursts are batched.
+                if line is _STOP or self.queue.empty():
+                    sys.stdout.buffer.flush()
+            except OSError:
+                # e.g. a closed pipe. The line is dropped, but the thread keeps
+                # draining so the queue cannot grow without bound.
+                pass
+            if line is _STOP:
+                return
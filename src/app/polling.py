@@ -0,0 +1,54 @@
+# app/polling.py
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from temporalio.client import WorkflowHandle, WorkflowQueryFailedError
+from temporalio.service import RPCError
+
+
+async def poll_until(
+    check: Callable[[], Awaitable[bool]],
+    timeout: float = 10.0,
+    first_delay: float = 0.01,
+    max_delay: float = 0.5,
+) -> bool:
+    """
+    Calls `check` with exponential backoff (10 ms, 20 ms, 40 ms, ...) until it
+    returns True or `timeout` seconds have passed. Returns whether it succeeded.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = first_delay
+    while True:
+        if await check():
+            return True
+        if loop.time() >= deadline:
+            return False
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+
+async def query_when_ready(
+    handle: WorkflowHandle, query: str = "get_current_state", timeout: float = 10.0
+) -> Any:
+    """
+    Returns the result of `query` as soon as the workflow can answer it.
+
+    A freshly started workflow reports RUNNING before a worker has processed
+    its first task, and queries fail until that happens. Polling the query
+    itself therefore waits exactly as long as needed, instead of sleeping.
+    Raises TimeoutError if the workflow does not answer within `timeout`.
+    """
+    result = None
+
+    async def answered() -> bool:
+        nonlocal result
+        try:
+            result = await handle.query(query)
+            return True
+        except (WorkflowQueryFailedError, RPCError):
+            return False
+
+    if not await poll_until(answered, timeout=timeout):
+        raise TimeoutError(f"Workflow {handle.id} did not answer '{query}' in time.")
+    return result
@@ -1,42 +1,167 @@
 # app/tracing.py
+import functools
+import itertools
 import os
+import time
+from typing import Optional, Sequence, Type
+import structlog
+from grpc import Compression
 from opentelemetry import trace
+from opentelemetry.context import Context
 from opentelemetry.sdk.resources import SERVICE_NAME, Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 
-def setup_tracing(service_name: str):
+# The app's structlog logger, so this goes through the same sink and level
+# filter as the rest of the bridge (stdlib logging is left unconfigured).
+log = structlog.get_logger()
+
+# gRPC caps messages at 4 MB by default; a batch of large spans over that limit
+# fails with ResourceExhausted and is dropped. Raise the ceiling and keep the
+# channel alive between the exporter's periodic flushes.
+GRPC_MAX_MESSAGE_LENGTH = 16 * 1024 * 1024
+GRPC_CHANNEL_OPTIONS = (
+    ("grpc.max_send_message_length", GRPC_MAX_MESSAGE_LENGTH),
+    ("grpc.max_receive_message_length", GRPC_MAX_MESSAGE_LENGTH),
+    ("grpc.keepalive_time_ms", 30000),
+)
+
+
+class RoundRobinSpanProcessor(SpanProcessor):
+    """
+    Hands each finished span to one of several span processors in turn.
+
+    A BatchSpanProcessor exports from a single thread and waits for each
+    export to finish, so one processor keeps at most one batch in flight.
+    Putting several processors, each with its own exporter and gRPC channel,
+    behind this one lets that many exports run at once, while each keeps its
+    own queue, export timeout and error reporting.
+    """
+
+    def __init__(self, processors: Sequence[SpanProcessor]):
+        self._processors = list(processors)
+        self._next = itertools.cycle(self._processors)
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        for processor in self._processors:
+            processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        next(self._next).on_end(span)
+
+    def shutdown(self) -> None:
+        for processor in self._processors:
+            processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        deadline = time.monotonic() + timeout_millis / 1000
+        for processor in self._processors:
+            remaining_millis = int((deadline - time.monotonic()) * 1000)
+            if remaining_millis <= 0 or not processor.force_flush(remaining_millis):
+                return False
+        return True
+
+
+def build_otlp_exporter(endpoint: str) -> SpanExporter:
+    """Builds the OTLP gRPC exporter used in production."""
+    return OTLPSpanExporter(
+        endpoint=endpoint,
+        insecure=True,  # Use insecure connection for local development.
+        # Span payloads are dominated by repeated attribute keys and compress well.
+        compression=Compression.Gzip,
+        channel_options=GRPC_CHANNEL_OPTIONS,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def build_resource(service_name: str) -> Resource:
+    """
+    Builds the resource identifying our service in Jaeger/OpenTelemetry.
+    `Resource.create` also runs the SDK's resource detectors (e.g. reading
+    OTEL_RESOURCE_ATTRIBUTES), so the result is cached per service name.
+    Per-process attributes such as the PID are deliberately left out, since a
+    cached value could be inherited across a fork.
+    """
+    return Resource.create({SERVICE_NAME: service_name})
+
+
+# The provider configured by `setup_tracing`, if it has already run.
+_provider: Optional[TracerProvider] = None
+
+def setup_tracing(
+    service_name: str,
+    exporter: Optional[SpanExporter] = None,
+    processor_cls: Type[SpanProcessor] = BatchSpanProcessor,
+) -> TracerProvider:
     """
     Configures and enables OpenTelemetry tracing for the application.
-    This function sets up a tracer that exports spans to a Jaeger collector
-    via the OTLP gRPC protocol.
+    By default this function sets up a tracer that exports spans to a Jaeger
+    collector via the OTLP gRPC protocol. Tests can pass their own `exporter`
+    (e.g. an InMemorySpanExporter) and `processor_cls` (e.g.
+    SimpleSpanProcessor) so that no collector connection is attempted.
+
+    It is idempotent: later calls return the provider from the first call,
+    so there is only ever one set of exporters and flush threads per process.
     """
+    global _provider
+    if _provider is not None:
+        return _provider
+
     # Create a resource to identify our service in Jaeger/OpenTelemetry.
-    resource = Resource(attributes={
-        SERVICE_NAME: service_name
-    })
+    resource = build_resource(service_name)
 
     # Create a TracerProvider, which is the cornerstone of the OpenTelemetry SDK.
+    # It registers its own atexit hook, so pending spans are flushed once on exit.
     provider = TracerProvider(resource=resource)
 
-    # Configure the OTLP exporter. This is the component that sends the trace
-    # data to the collector (in our case, Jaeger).
-    # The endpoint must match the gRPC receiver of the Jaeger container.
-    # We use an environment variable to make this configurable.
-    jaeger_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "jaeger:4317")
-    otlp_exporter = OTLPSpanExporter(
-        endpoint=jaeger_endpoint,
-        insecure=True  # Use insecure connection for local development.
-    )
+    def make_processor(span_exporter: SpanExporter) -> SpanProcessor:
+        if issubclass(processor_cls, BatchSpanProcessor):
+            # Use a BatchSpanProcessor to group spans together and send them in batches
+            # for better performance. The SDK defaults (queue 2048, 5 s delay) drop spans
+            # under bursts and delay visualization, so we use a larger queue and flush
+            # more often, and batches are kept small enough to stay well below the gRPC
+            # message size limit. The standard OTEL_BSP_* variables override these values.
+            return processor_cls(
+                span_exporter,
+                max_queue_size=int(os.getenv("OTEL_BSP_MAX_QUEUE_SIZE", 4096)),
+                schedule_delay_millis=int(os.getenv("OTEL_BSP_SCHEDULE_DELAY", 1000)),
+                max_export_batch_size=int(os.getenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", 128)),
+                export_timeout_millis=int(os.getenv("OTEL_BSP_EXPORT_TIMEOUT", 10000)),
+            )
+        return processor_cls(span_exporter)
 
-    # Use a BatchSpanProcessor to group spans together and send them in batches
-    # for better performance.
-    span_processor = BatchSpanProcessor(otlp_exporter)
+    if exporter is None:
+        # Configure the OTLP exporter. This is the component that sends the trace
+        # data to the collector (in our case, Jaeger).
+        # The endpoint must match the gRPC receiver of the Jaeger container.
+        # We use an environment variable to make this configurable.
+        jaeger_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "jaeger:4317")
+        destination = jaeger_endpoint
+        # A single channel allows only one export in flight at a time, which limits
+        # throughput when the collector is not local. Unless OTEL_EXPORTER_OTLP_POOL
+        # is 1, spans are spread over that many processors, each with its own
+        # exporter and channel (the OTEL_BSP_* values apply to each of them).
+        pool_size = max(1, int(os.getenv("OTEL_EXPORTER_OTLP_POOL", 4)))
+        processors = [
+            make_processor(build_otlp_exporter(jaeger_endpoint)) for _ in range(pool_size)
+        ]
+        span_processor = (
+            processors[0] if pool_size == 1 else RoundRobinSpanProcessor(processors)
+        )
+    else:
+        destination = type(exporter).__name__
+        span_processor = make_processor(exporter)
     provider.add_span_processor(span_processor)
 
     # Set our configured provider as the global tracer provider.
     # From now on, any call to trace.get_tracer(__name__) will use this provider.
     trace.set_tracer_provider(provider)
+    _provider = provider
 
-    print(f"✅ OpenTelemetry tracing configured for '{service_name}', exporting to {jaeger_endpoint}")
+    log.info(
+        "OpenTelemetry tracing configured",
+        service_name=service_name,
+        destination=destination,
+    )
+    return provider
@@ -0,0 +1,146 @@
+import asyncio
+import os
+import pytest
+import uvicorn
+
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from temporalio.client import Client
+from temporalio.worker import Worker
+
+from app.bridge import app
+from app.tracing import setup_tracing
+from tracerail.workflows.flexible_case_workflow import FlexibleCaseWorkflow
+from tests.helpers import wait_for_api, wait_for_worker
+
+# --- Test Constants ---
+# Under pytest-xdist each worker ("gw0", "gw1", ...) runs its own session, so
+# the API port is made unique per worker to avoid collisions.
+XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER", "gw0")
+XDIST_WORKER_INDEX = int(XDIST_WORKER.removeprefix("gw"))
+
+HOST = "127.0.0.1"
+API_PORT = 8000 + XDIST_WORKER_INDEX
+TEMPORAL_HOST = os.getenv("TEMPORAL_HOST", "localhost")
+TEMPORAL_PORT = int(os.getenv("TEMPORAL_PORT", 7233))
+TEMPORAL_NAMESPACE = os.getenv("TEMPORAL_NAMESPACE", "default")
+# Every task queue used by the suite: case creation, and the queue the
+# bridge's Pact provider-state handler starts workflows on. Both names are
+# chosen by the code that starts the workflows (CaseService and the bridge),
+# not by the tests, so they are not suffixed per xdist worker. Workers on one
+# queue all register the same workflow, so any of them can run a given case.
+TASK_QUEUES = [
+    os.getenv("TEMPORAL_CASES_TASK_QUEUE", "cases-task-queue"),
+    "pact-verification-task-queue",
+]
+
+
+# --- Pytest Fixture to Force Asyncio Backend ---
+
+@pytest.fixture(scope='session')
+def anyio_backend():
+    """
+    Forces pytest-anyio to use the 'asyncio' backend for all tests in this session,
+    preventing it from trying to run tests with 'trio'.
+    """
+    return 'asyncio'
+
+
+# --- In-Memory Tracing ---
+
+@pytest.fixture(scope='session', autouse=True)
+def span_exporter():
+    """
+    Configures tracing to collect spans in memory before any app lifespan runs.
+    `setup_tracing` is idempotent, so the app's own call then reuses this
+    provider instead of retrying an OTLP connection to a collector that does
+    not exist under test. Tests can inspect finished spans via this fixture.
+    """
+    exporter = InMemorySpanExporter()
+    setup_tracing(
+        "tracerail-task-bridge", exporter=exporter, processor_cls=SimpleSpanProcessor
+    )
+    return exporter
+
+
+# --- Session-Scoped Integration Stack ---
+# These are started at most once per session and only for tests that ask for
+# them, so each additional integration test adds no startup cost.
+
+@pytest.fixture(scope='session')
+async def temporal_client():
+    """
+    A single Temporal client shared by every test in the session, so the gRPC
+    connection handshake is paid once rather than once per test.
+    Tests that need it are skipped if Temporal is not reachable.
+    """
+    try:
+        client = await Client.connect(
+            f"{TEMPORAL_HOST}:{TEMPORAL_PORT}", namespace=TEMPORAL_NAMESPACE
+        )
+    except RuntimeError as e:
+        pytest.skip(f"Could not connect to Temporal: {e}")
+    yield client
+
+
+@pytest.fixture(scope='session')
+async def temporal_worker_tasks(temporal_client):
+    """
+    Workers for every task queue the suite uses, run as tasks on the test
+    event loop and sharing the session's Temporal client, rather than in a
+    separate process with its own interpreter and connection.
+
+    This only starts them; `temporal_worker` and `api_server` wait for their
+    pollers, so that other startup work can overlap with worker boot.
+    """
+    worker_tasks = [
+        asyncio.create_task(
+            Worker(
+                temporal_client,
+                task_queue=task_queue,
+                workflows=[FlexibleCaseWorkflow],
+            ).run()
+        )
+        for task_queue in TASK_QUEUES
+    ]
+    try:
+        yield
+    finally:
+        for worker_task in worker_tasks:
+            worker_task.cancel()
+        await asyncio.gather(*worker_tasks, return_exceptions=True)
+
+
+async def wait_for_workers(client: Client):
+    """Waits until every task queue in TASK_QUEUES has a polling worker."""
+    await asyncio.gather(*(wait_for_worker(client, task_queue) for task_queue in TASK_QUEUES))
+
+
+@pytest.fixture(scope='session')
+async def temporal_worker(temporal_client, temporal_worker_tasks):
+    """The session's workers, once every one of them is polling its task queue."""
+    await wait_for_workers(temporal_client)
+
+
+@pytest.fixture(scope='session')
+async def api_server(temporal_client, temporal_worker_tasks):
+    """
+    A real uvicorn server for tests that need a TCP endpoint, backed by the
+    session's workers. Yields its base URL once both are ready; the server
+    boots (and its lifespan connects to Temporal) while the workers register.
+
+    The server runs as a task on the test event loop rather than in a forked
+    process: the Temporal runtime started by the other fixtures does not
+    survive a fork, and the app keeps using the in-memory tracer.
+    """
+    server = uvicorn.Server(
+        uvicorn.Config(app, host=HOST, port=API_PORT, log_level="warning")
+    )
+    server_task = asyncio.create_task(server.serve())
+    base_url = f"http://{HOST}:{API_PORT}"
+    try:
+        await asyncio.gather(wait_for_api(base_url), wait_for_workers(temporal_client))
+        yield base_url
+    finally:
+        server.should_exit = True
+        await server_task
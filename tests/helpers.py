@@ -0,0 +1,40 @@
+"""Readiness probes shared by the integration tests."""
+
+import httpx
+import pytest
+from temporalio.api.enums.v1 import TaskQueueType
+from temporalio.api.taskqueue.v1 import TaskQueue
+from temporalio.api.workflowservice.v1 import DescribeTaskQueueRequest
+from temporalio.client import Client
+
+from app.polling import poll_until
+
+
+async def wait_for_api(base_url: str, timeout: float = 10.0):
+    """Waits until the API server at `base_url` accepts HTTP requests."""
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        async def responds() -> bool:
+            try:
+                await client.get("/")
+                return True
+            except httpx.TransportError:
+                return False
+
+        if not await poll_until(responds, timeout=timeout):
+            pytest.fail(f"API server at {base_url} did not become ready.")
+
+
+async def wait_for_worker(client: Client, task_queue: str, timeout: float = 10.0):
+    """Waits until at least one worker is polling `task_queue` for workflow tasks."""
+    request = DescribeTaskQueueRequest(
+        namespace=client.namespace,
+        task_queue=TaskQueue(name=task_queue),
+        task_queue_type=TaskQueueType.TASK_QUEUE_TYPE_WORKFLOW,
+    )
+
+    async def has_poller() -> bool:
+        response = await client.workflow_service.describe_task_queue(request)
+        return len(response.pollers) > 0
+
+    if not await poll_until(has_poller, timeout=timeout):
+        pytest.fail(f"No worker started polling task queue '{task_queue}'.")
@@ -0,0 +1,66 @@
+import pytest
+from httpx import AsyncClient
+
+from app.bridge import app
+
+TENANT_ID = "tenant-123"
+AUTH_HEADERS = {"Authorization": f"Bearer test-token-for-{TENANT_ID}"}
+DECISION_URL = f"/api/v1/tenants/{TENANT_ID}/cases/case-1/decision"
+
+
+@pytest.mark.anyio
+async def test_invalid_decision_body_returns_fastapi_style_422():
+    """
+    The decision body is validated straight from JSON by a custom dependency.
+    Invalid bodies must still produce FastAPI's usual 422 error shape, with
+    the error location rooted at "body".
+    """
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            DECISION_URL, headers=AUTH_HEADERS, json={"not_a_decision": "approved"}
+        )
+
+    assert response.status_code == 422
+    errors = response.json()["detail"]
+    assert errors[0]["loc"] == ["body", "decision"]
+    assert errors[0]["type"] == "missing"
+
+
+@pytest.mark.anyio
+async def test_malformed_json_decision_body_returns_422():
+    """A body that is not valid JSON is rejected before touching Temporal."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            DECISION_URL,
+            headers={**AUTH_HEADERS, "Content-Type": "application/json"},
+            content=b"{not json",
+        )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+
+
+@pytest.mark.anyio
+async def test_non_utf8_decision_body_returns_422():
+    """Raw bytes that are not even UTF-8 are a 422, not a 500 while rendering the error."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            DECISION_URL,
+            headers={**AUTH_HEADERS, "Content-Type": "application/json"},
+            content=b"\xff",
+        )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+
+
+@pytest.mark.anyio
+async def test_empty_decision_body_is_reported_missing():
+    """An empty body is reported the way FastAPI reports a missing body parameter."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(DECISION_URL, headers=AUTH_HEADERS)
+
+    assert response.status_code == 422
+    errors = response.json()["detail"]
+    assert errors[0]["loc"] == ["body"]
+    assert errors[0]["type"] == "missing"
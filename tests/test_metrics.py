@@ -12,17 +12,15 @@ async def test_metrics_endpoint_produces_latency_metric():
     necessary latency histogram metric.
 
     This test runs the FastAPI app directly with an async client,
-    avoiding the need for a separate running server process.
+    avoiding the need for a separate running server process. The app's
+    lifespan is not run, so no Temporal connection is attempted.
     """
-    # Set the TESTING_MODE environment variable to avoid the Temporal connection,
-    # which is not needed for this specific test.
-    import os
-    os.environ["TESTING_MODE"] = "true"
-
     async with AsyncClient(app=app, base_url="http://test") as client:
-        # Make a request to a valid endpoint to generate some metrics
-        response = await client.get("/")
-        assert response.status_code == 200
+        # Make a request to an instrumented API endpoint to generate some metrics.
+        # The landing page is excluded from instrumentation, and an
+        # unauthenticated request is rejected before any Temporal call is made.
+        response = await client.get("/api/v1/tenants/tenant-123/cases/case-1")
+        assert response.status_code == 401
 
         # Now, scrape the /metrics endpoint
         metrics_response = await client.get("/metrics")
@@ -42,5 +40,20 @@ async def test_metrics_endpoint_produces_latency_metric():
 
         assert latency_metric_found, "The http_request_duration_seconds histogram was not found in the /metrics output."
 
-    # Unset the environment variable to avoid side effects in other tests
-    del os.environ["TESTING_MODE"]
+
+@pytest.mark.anyio
+async def test_metrics_excludes_landing_page():
+    """
+    Tests that requests to the landing page are not recorded, since only the
+    API routes are instrumented.
+    """
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/")
+        assert response.status_code == 200
+
+        metrics_response = await client.get("/metrics")
+        assert metrics_response.status_code == 200
+
+        for family in text_string_to_metric_families(metrics_response.text):
+            for sample in family.samples:
+                assert sample.labels.get("handler") not in ("/", "/metrics")